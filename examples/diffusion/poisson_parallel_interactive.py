@@ -31,6 +31,11 @@ Notes
 - This example can serve as a template for solving a linear single-field scalar
   problem - just replace the equations in :func:`create_local_problem()`.
 - The command line options are saved into <output_dir>/options.txt file.
+- With the ``--distributed`` option, the mesh is partitioned and the partitions
+  with a ghost layer are saved in the preprocessing step on task zero (in
+  practice, this would be done off-line). Each task then reads only its
+  partition and creates its local problem and PETSc DOFs numbering without the
+  whole mesh. Only the approximation order one is supported in this mode.
 
 Usage Examples
 --------------
@@ -56,6 +61,8 @@ Parallel runs::
 
   $ mpiexec -n 5 python examples/diffusion/poisson_parallel_interactive.py output-parallel -2 --shape=101,101 --verify --metis -ksp_monitor -ksp_converged_reason
 
+  $ mpiexec -n 4 python examples/diffusion/poisson_parallel_interactive.py output-parallel -2 --shape=101,101 --metis --distributed
+
 View the results using::
 
   $ python postproc.py output-parallel/sol.h5 --wireframe -b -d'u,plot_warp_scalar'
@@ -84,15 +91,17 @@ from sfepy.solvers.ls import PETScKrylovSolver
 import sfepy.parallel.parallel as pl
 import sfepy.parallel.plot_parallel_dofs as ppd
 
-def create_local_problem(omega_gi, order):
+def create_local_problem(omega_gi, order, bbox=None):
     """
     Local problem definition using a domain corresponding to the global region
-    `omega_gi`.
+    `omega_gi`. The global mesh bounding box `bbox` has to be given, if the
+    domain of `omega_gi` is not the whole mesh.
     """
     mesh = omega_gi.domain.mesh
 
-    # All tasks have the whole mesh.
-    bbox = mesh.get_bounding_box()
+    if bbox is None:
+        # All tasks have the whole mesh.
+        bbox = mesh.get_bounding_box()
     min_x, max_x = bbox[:, 0]
     eps_x = 1e-8 * (max_x - min_x)
 
@@ -181,6 +190,118 @@ def verify_save_dof_maps(field, cell_tasks, dof_maps, id_map, options,
                             'para-domains-cells.h5')
     mesh.write(filename, out={'cells' : out})
 
+def solve_problem_distributed(options, comm):
+    """
+    Solve the problem with each task reading only its mesh partition.
+    """
+    order = options.order
+
+    rank, size = comm.Get_rank(), comm.Get_size()
+
+    output('rank', rank, 'of', size)
+
+    mesh_i, partition = pl.load_mesh_partition(options.output_dir, rank,
+                                               verbose=True)
+
+    mpi = comm.tompi4py()
+    bbox = mesh_i.get_bounding_box()
+    bbox = nm.array([mpi.allreduce(bbox[0], op=pl.MPI.MIN),
+                     mpi.allreduce(bbox[1], op=pl.MPI.MAX)])
+
+    output('creating local problem...')
+    tt = time.clock()
+
+    domain_i = FEDomain('domain_gi', mesh_i)
+    omega_gi = domain_i.create_region('Omega', 'all')
+
+    pb = create_local_problem(omega_gi, order, bbox=bbox)
+
+    output('...done in', time.clock() - tt)
+
+    variables = pb.get_variables()
+    eqs = pb.equations
+
+    u_i = variables['u_i']
+    field_i = u_i.field
+
+    output('distributing field %s...' % field_i.name)
+    tt = time.clock()
+
+    lfds = pl.distribute_local_fields_dofs([field_i], partition,
+                                           comm=comm, verbose=True)
+
+    output('...done in', time.clock() - tt)
+
+    output('allocating global system...')
+    tt = time.clock()
+
+    sizes, drange, pdofs = pl.setup_composite_dofs(lfds, [field_i],
+                                                   variables, verbose=True)
+    pmtx, psol, prhs = pl.create_petsc_system(pb.mtx_a, sizes, pdofs, drange,
+                                              is_overlap=True, comm=comm,
+                                              verbose=True)
+
+    output('...done in', time.clock() - tt)
+
+    output('evaluating local problem...')
+    tt = time.clock()
+
+    state = State(variables)
+    state.fill(0.0)
+    state.apply_ebc()
+
+    rhs_i = eqs.eval_residuals(state())
+    # This must be after pl.create_petsc_system() call!
+    mtx_i = eqs.eval_tangent_matrices(state(), pb.mtx_a)
+
+    output('...done in', time.clock() - tt)
+
+    output('assembling global system...')
+    tt = time.clock()
+
+    apply_ebc_to_matrix(mtx_i, u_i.eq_map.eq_ebc)
+    pl.assemble_rhs_to_petsc(prhs, rhs_i, pdofs, drange, is_overlap=True,
+                             comm=comm, verbose=True)
+    pl.assemble_mtx_to_petsc(pmtx, mtx_i, pdofs, drange, is_overlap=True,
+                             comm=comm, verbose=True)
+
+    output('...done in', time.clock() - tt)
+
+    output('creating solver...')
+    tt = time.clock()
+
+    conf = Struct(method='cg', precond='gamg', sub_precond='none',
+                  i_max=10000, eps_a=1e-50, eps_r=1e-5, eps_d=1e4, verbose=True)
+    status = {}
+    ls = PETScKrylovSolver(conf, comm=comm, mtx=pmtx, status=status)
+
+    output('...done in', time.clock() - tt)
+
+    output('solving...')
+    tt = time.clock()
+
+    psol = ls(prhs, psol)
+
+    psol_i = pl.create_local_petsc_vector(pdofs)
+    gather, scatter = pl.create_gather_scatter(pdofs, psol_i, psol, comm=comm)
+
+    scatter(psol_i, psol)
+
+    sol0_i = state() - psol_i[...]
+
+    output('...done in', time.clock() - tt)
+
+    output('saving solution...')
+    tt = time.clock()
+
+    u_i.set_data(sol0_i)
+    out = u_i.create_output()
+
+    filename = os.path.join(options.output_dir, 'sol_%02d.h5' % comm.rank)
+    pb.domain.mesh.write(filename, io='auto', out=out)
+
+    output('...done in', time.clock() - tt)
+
 def solve_problem(mesh_filename, options, comm):
     order = options.order
 
@@ -374,6 +495,9 @@ helps = {
     ' [default: %(default)s]',
     'metis' :
     'use metis for domain partitioning',
+    'distributed' :
+    'each task reads only its mesh partition with a ghost layer,'
+    ' saved in a preprocessing step; --verify and --plot are ignored',
     'verify' :
     'verify domain partitioning, save cells and DOFs of tasks'
     ' for visualization',
@@ -414,6 +538,9 @@ def main():
     parser.add_argument('--metis',
                         action='store_true', dest='metis',
                         default=False, help=helps['metis'])
+    parser.add_argument('--distributed',
+                        action='store_true', dest='distributed',
+                        default=False, help=helps['distributed'])
     parser.add_argument('--verify',
                         action='store_true', dest='verify',
                         default=False, help=helps['verify'])
@@ -479,11 +606,26 @@ def main():
                               verbose=True)
         mesh.write(mesh_filename, io='auto')
 
+        if options.distributed:
+            # The only step requiring the whole mesh.
+            cell_tasks = pl.partition_mesh(mesh, comm.size,
+                                           use_metis=options.metis,
+                                           verbose=True)
+            pl.save_mesh_partitions(mesh, cell_tasks, output_dir,
+                                    verbose=True)
+
     comm.barrier()
 
     output('field order:', options.order)
 
-    solve_problem(mesh_filename, options, comm)
+    if options.distributed:
+        if options.order != 1:
+            raise ValueError('only order 1 is supported with --distributed!')
+
+        solve_problem_distributed(options, comm)
+
+    else:
+        solve_problem(mesh_filename, options, comm)
 
 if __name__ == '__main__':
     main()
@@ -28,7 +28,9 @@ import sfepy.homogenization.coefs_base as cb
 from sfepy import data_dir
 from sfepy.base.base import Struct
 from sfepy.homogenization.recovery import compute_micro_u,\
-    compute_stress_strain_u, compute_mac_stress_part
+    compute_stress_strain_u, compute_mac_stress_part,\
+    compute_micro_u_batch, compute_stress_strain_u_batch,\
+    compute_mac_stress_part_batch
 
 
 def recovery_le(pb, corrs, macro):
@@ -58,6 +60,40 @@ def recovery_le(pb, corrs, macro):
     return out
 
 
+def recovery_le_batch(pb, corrs, macro):
+    """
+    The batch version of recovery_le(): `macro` contains the data of several
+    macroscopic points, see the 'recovery_batch_size' option.
+    """
+    out = {}
+
+    dim = corrs['corrs_le']['u_00'].shape[1]
+    mic_u = - compute_micro_u_batch(corrs['corrs_le'], macro['strain'], 'u',
+                                    dim)
+
+    out['u_mic'] = Struct(name='output_data',
+                          mode='vertex', data=mic_u,
+                          var_name='u', dofs=None)
+
+    stress_Y, strain_Y = \
+        compute_stress_strain_u_batch(pb, 'i', 'Y', 'mat.D', 'u',
+                                      corrs['corrs_le'], macro['strain'],
+                                      coef=-1.0)
+    stress_Y += \
+        compute_mac_stress_part_batch(pb, 'i', 'Y', 'mat.D', 'u',
+                                      macro['strain'])
+
+    strain = macro['strain'][:, None, None] + strain_Y
+
+    out['cauchy_strain'] = Struct(name='output_data',
+                                  mode='cell', data=strain,
+                                  dofs=None)
+    out['cauchy_stress'] = Struct(name='output_data',
+                                  mode='cell', data=stress_Y,
+                                  dofs=None)
+    return out
+
+
 filename_mesh = data_dir + '/meshes/3d/matrix_fiber.mesh'
 dim = 3
 region_lbn = (0, 0, 0)
@@ -128,6 +164,9 @@ options = {
     'output_dir': 'output',
     'coefs_filename': 'coefs_le',
     'recovery_hook': 'recovery_le',
+    # Use instead for recovering many macroscopic points:
+    # 'recovery_hook': 'recovery_le_batch',
+    # 'recovery_batch_size': 1000,
 }
 
 equation_corrs = {
@@ -41,6 +41,10 @@ Solve using the Bathe method::
 
   python simple.py examples/linear_elasticity/elastodynamic.py -O "ts='tsb'"
 
+Solve using the explicit central difference method with the lumped mass::
+
+  python simple.py examples/linear_elasticity/elastodynamic.py -O "ts='tscd'"
+
 View the resulting deformation using:
 
 - color by :math:`\ul{u}`::
@@ -242,6 +246,22 @@ solvers = {
 
         'verbose' : 1,
     }),
+    'tscd' : ('ts.central_difference', {
+        # Explicit method with lumped mass -> the output time steps are
+        # subdivided according to the stable time step estimate.
+        't0' : 0.0,
+        't1' : t1,
+        'dt' : dt,
+        'n_step' : None,
+
+        'is_linear'  : True,
+
+        'lumping' : 'row_sum',
+        'wave_speed' : cl,
+        'cfl' : 0.9,
+
+        'verbose' : 1,
+    }),
     'tsn' : ('ts.newmark', {
         't0' : 0.0,
         't1' : t1,